@@ -54,6 +54,30 @@ def zloads(zbytes):
         return pickle.loads(zbytes)
 
 
+def loads_product(zbytes):
+    """
+    Decompress and decode a stored data product.
+
+    Data products are stored pickled and compressed by `zdumps`.  Products
+    stored as the compressed string representation of a
+    {"pickled": ..., "value": ...} dictionary (see `compress`) are also
+    supported.
+
+    :param zbytes: stored byte stream
+    :return: returns python object
+    """
+    try:
+        raw = zlib.decompress(zbytes)
+    except zlib.error:
+        raw = zbytes
+    if raw[:1] == pickle.PROTO:  # Pickles of protocol 2 and above start with the PROTO opcode
+        return pickle.loads(raw)
+    value = ast.literal_eval(raw.decode(_ENCODING))
+    if value.get("pickled"):
+        return zloads(value.get("value"))
+    return value.get("value")
+
+
 def compress(obj):
     """
     Compress python object
@@ -361,10 +385,9 @@ class DataBlock:
                 missed_update_count=0,
             )
 
-        if isinstance(value, dict):
-            store_value = compress({"pickled": False, "value": value})
-        else:
-            store_value = compress({"pickled": True, "value": pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)})
+        # Storing the pickle directly avoids embedding its string representation in a
+        # dictionary that must be parsed back with ast.literal_eval on every read.
+        store_value = zdumps(value)
         self.logger.debug("datablock waiting for internal write lock in '_setitem'")
         with self.__internal_data_write_lock:
             if key in self:
@@ -381,11 +404,7 @@ class DataBlock:
 
         try:
             for value in values:
-                v = ast.literal_eval(decompress(value.get("value")))
-                if v.get("pickled"):
-                    v = zloads(v.get("value"))
-                else:
-                    v = value.get("value")
+                v = loads_product(value.get("value"))
                 result.append(
                     {
                         "key": value["key"],
@@ -409,20 +428,17 @@ class DataBlock:
 
         try:
             value = self.dataspace.get_dataproduct(self.sequence_id, self.generation_id, key)
-            value = ast.literal_eval(decompress(value))
         except KeyError:
             self.logger.error(f"Did not get key '{key}' in datablock __getitem__")
-            value = default
+            if default is not None:
+                return default
+            value = None
 
         if not value:
             self.logger.exception(f"No key '{key}' in datablock __getitem__")
             raise KeyError(f"No key '{key}' in datablock __getitem__")
 
-        if value.get("pickled"):
-            return_value = zloads(value.get("value"))
-        else:
-            return_value = value.get("value")
-        return return_value
+        return loads_product(value)
 
     def get_header(self, key):
         """
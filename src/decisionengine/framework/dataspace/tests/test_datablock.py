@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import ast
+import pickle
 
 import pytest
 
@@ -107,6 +108,47 @@ def test_DataBlock_no_key_by_name(dataspace):  # noqa: F811
         dblock["no_such_key_exists"]
 
 
+def test_DataBlock_get_default(dataspace):  # noqa: F811
+    my_tm = dataspace.get_taskmanagers()[0]  # fetch one of our loaded examples
+    header = datablock.Header(my_tm["taskmanager_id"])
+    dblock = datablock.DataBlock(dataspace, my_tm["name"], my_tm["taskmanager_id"])
+
+    dblock.put("example_test_key", "example_test_value", header)
+
+    assert dblock.get("no_such_key_exists", "default_value") == "default_value"
+    # Falsy defaults are returned as well
+    for default in (0, "", {}, []):
+        assert dblock.get("no_such_key_exists", default) == default
+
+    with pytest.raises(KeyError):
+        dblock.get("no_such_key_exists")
+
+
+def test_DataBlock_legacy_products(dataspace):  # noqa: F811
+    my_tm = dataspace.get_taskmanagers()[0]  # fetch one of our loaded examples
+    header = datablock.Header(my_tm["taskmanager_id"])
+    metadata = datablock.Metadata(
+        my_tm["taskmanager_id"],
+        generation_id=dataspace.get_last_generation_id(my_tm["name"], my_tm["taskmanager_id"]),
+    )
+    dblock = datablock.DataBlock(dataspace, my_tm["name"], my_tm["taskmanager_id"])
+
+    # Products written in the format used before products were stored as plain
+    # compressed pickles must still be readable.
+    newDict = {"subKey": "newValue"}
+    legacy_values = {
+        "legacy_dict_key": datablock.compress({"pickled": False, "value": newDict}),
+        "legacy_pickled_key": datablock.compress(
+            {"pickled": True, "value": pickle.dumps("example_test_value", protocol=pickle.HIGHEST_PROTOCOL)}
+        ),
+    }
+    for key, value in legacy_values.items():
+        dataspace.insert(dblock.sequence_id, dblock.generation_id, key, value, header, metadata)
+
+    assert dblock["legacy_dict_key"] == newDict
+    assert dblock["legacy_pickled_key"] == "example_test_value"
+
+
 def test_DataBlock_get_header(dataspace):  # noqa: F811
     my_tm = dataspace.get_taskmanagers()[0]  # fetch one of our loaded examples
     header = datablock.Header(my_tm["taskmanager_id"])
@@ -196,6 +238,20 @@ def test_DataBlock_get_dataproducts(dataspace):  # noqa: F811
     assert products[0]["value"] == "example_test_value"
 
 
+def test_DataBlock_get_dataproducts_dict(dataspace):  # noqa: F811
+    my_tm = dataspace.get_taskmanagers()[0]  # fetch one of our loaded examples
+    header = datablock.Header(my_tm["taskmanager_id"])
+    dblock = datablock.DataBlock(dataspace, my_tm["name"], my_tm["taskmanager_id"])
+
+    newDict = {"subKey": "newValue"}
+    dblock.put("new_example_test_key", newDict, header)
+
+    products = dblock.get_dataproducts("new_example_test_key")
+    assert len(products) == 1
+    assert products[0]["key"] == "new_example_test_key"
+    assert products[0]["value"] == newDict
+
+
 def test_DataBlock_duplicate(dataspace):  # noqa: F811
     my_tm = dataspace.get_taskmanagers()[0]  # fetch one of our loaded examples
     header = datablock.Header(my_tm["taskmanager_id"])
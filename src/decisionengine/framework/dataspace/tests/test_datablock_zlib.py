@@ -29,6 +29,25 @@ def test_zloads():
     assert value == {"a": {"b": "c"}}
 
 
+def test_loads_product():
+    value = datablock.loads_product(datablock.zdumps({"a": {"b": "c"}}))
+    assert value == {"a": {"b": "c"}}
+
+    # Products stored as the string representation of a dictionary
+    zbytes = datablock.compress(
+        {
+            "pickled": True,
+            "value": pickle.dumps({"a": {"b": "c"}}, protocol=pickle.HIGHEST_PROTOCOL),
+        }
+    )
+    value = datablock.loads_product(zbytes)
+    assert value == {"a": {"b": "c"}}
+
+    zbytes = datablock.compress({"pickled": False, "value": {"a": {"b": "c"}}})
+    value = datablock.loads_product(zbytes)
+    assert value == {"a": {"b": "c"}}
+
+
 def test_compress():
     zbytes = datablock.compress(
         {
@@ -34,6 +34,11 @@ class ChannelWorker(multiprocessing.Process):
         super().__init__(name=f"DEChannelWorker-{task_manager.name}")
         self.task_manager = task_manager
         self.logger_config = logger_config
+        # The modules of a channel do not change once it has been created,
+        # so what they produce and consume is only computed on first use.
+        self._produces = None
+        self._consumes = None
+        self._produces_index = None
 
     def wait_while(self, state, timeout=None):
         return self.task_manager.state.wait_while(state, timeout)
@@ -42,10 +47,22 @@ class ChannelWorker(multiprocessing.Process):
         return self.task_manager.get_state_name()
 
     def get_produces(self):
-        return self.task_manager.get_produces()
+        if self._produces is None:
+            self._produces = self.task_manager.get_produces()
+        return self._produces
 
     def get_consumes(self):
-        return self.task_manager.get_consumes()
+        if self._consumes is None:
+            self._consumes = self.task_manager.get_consumes()
+        return self._consumes
+
+    def get_produces_index(self):
+        """Return a dictionary mapping each product of the channel to the module producing it."""
+        if self._produces_index is None:
+            self._produces_index = {
+                product: module for module, products in self.get_produces().items() for product in products
+            }
+        return self._produces_index
 
     def setup_logger(self):
         myname = self.task_manager.name
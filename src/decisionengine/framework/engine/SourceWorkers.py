@@ -162,10 +162,12 @@ class SourceWorker(multiprocessing.Process):
                     Module.verify_products(self.module_instance, data)
                     self.logger.info(f"Source {self.key} acquire returned")
                     SOURCE_ACQUIRE_GAUGE.labels(self.key).set_to_current_time()
-                    self.logger.debug(
-                        f"Publishing data to queue {self.queue.name} with routing key {self.key}"
-                        + f" ({len(pickle.dumps(data))} pickled bytes)"
-                    )
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        # Only pickle the data for its size when the message will be emitted.
+                        self.logger.debug(
+                            f"Publishing data to queue {self.queue.name} with routing key {self.key}"
+                            + f" ({len(pickle.dumps(data))} pickled bytes)"
+                        )
                     producer.publish(
                         dict(source_name=self.key, source_module=self.module, data=data),
                         routing_key=self.key,
@@ -28,6 +28,12 @@ class TaskManager:
     def set_loglevel_value(self, value):
         pass
 
+    def get_produces(self):
+        return {"source1": ["foo"], "transform1": ["bar", "baz"]}
+
+    def get_consumes(self):
+        return {"transform1": ["foo"]}
+
 
 _TASK_MANAGER = TaskManager()
 
@@ -45,6 +51,21 @@ def test_worker_name(global_config):
     assert worker.name == f"DEChannelWorker-{_TASK_MANAGER.name}"
 
 
+def test_worker_produces_index(global_config):
+    worker = ChannelWorker(_TASK_MANAGER, global_config["logger"])
+
+    assert worker.get_produces_index() == {"foo": "source1", "bar": "transform1", "baz": "transform1"}
+    assert worker.get_produces_index() is worker.get_produces_index()
+
+
+def test_worker_produces_consumes_cached(global_config):
+    worker = ChannelWorker(_TASK_MANAGER, global_config["logger"])
+
+    assert worker.get_produces() is worker.get_produces()
+    assert worker.get_consumes() == {"transform1": ["foo"]}
+    assert worker.get_consumes() is worker.get_consumes()
+
+
 def test_worker_logger_sized_rotation(global_config):
     worker = ChannelWorker(_TASK_MANAGER, global_config["logger"])
     worker.setup_logger()
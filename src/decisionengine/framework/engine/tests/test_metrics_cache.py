@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2017 Fermi Research Alliance, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from threading import Lock
+
+import structlog
+
+import decisionengine.framework.engine.DecisionEngine as DecisionEngine
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _decision_engine():
+    # Only the attributes used by metrics are needed.
+    de = DecisionEngine.DecisionEngine.__new__(DecisionEngine.DecisionEngine)
+    de._metrics_lock = Lock()
+    de._metrics_time = None
+    de._metrics_text = None
+    de.logger = structlog.getLogger("test_metrics_cache")
+    return de
+
+
+def test_metrics_cache(monkeypatch):
+    renderings = []
+
+    def display_metrics():
+        renderings.append(None)
+        return f"rendering {len(renderings)}"
+
+    clock = Clock()
+    monkeypatch.setattr(DecisionEngine, "display_metrics", display_metrics)
+    monkeypatch.setattr(DecisionEngine.time, "monotonic", clock)
+    de = _decision_engine()
+
+    assert de.metrics() == "rendering 1"
+    clock.now += DecisionEngine.METRICS_CACHE_TTL / 2
+    assert de.metrics() == "rendering 1"
+    assert len(renderings) == 1
+
+    clock.now += DecisionEngine.METRICS_CACHE_TTL
+    assert de.metrics() == "rendering 2"
+    assert len(renderings) == 2
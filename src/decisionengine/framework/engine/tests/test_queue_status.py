@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2017 Fermi Research Alliance, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+import tabulate
+
+from decisionengine.framework.engine.DecisionEngine import _queue_status_table
+
+_HEADERS = ["Source name", "Queue name", "Unconsumed messages"]
+
+
+def test_queue_status_table_none():
+    status = [["", "client.requests", "None"], ["source1", "source1.ABCD", "None"]]
+    assert _queue_status_table(status) == (
+        "Source name    Queue name       Unconsumed messages\n"
+        "-------------  ---------------  ---------------------\n"
+        "               client.requests  None\n"
+        "source1        source1.ABCD     None"
+    )
+
+
+def test_queue_status_table_numeric():
+    status = [["", "client.requests", "0"], ["source1", "source1.ABCD", "12"]]
+    assert _queue_status_table(status) == (
+        "Source name    Queue name         Unconsumed messages\n"
+        "-------------  ---------------  ---------------------\n"
+        "               client.requests                      0\n"
+        "source1        source1.ABCD                        12"
+    )
+
+
+@pytest.mark.parametrize(
+    "status",
+    [
+        [],
+        [["", "client.requests", "None"], ["source1", "source1.ABCD", "None"]],
+        [["", "client.requests", "0"], ["source1", "source1.ABCD", "12"]],
+        [["", "client.requests", "3"], ["a_source_with_a_long_name", "q", "None"]],
+        [["", "client.requests", "3"], ["source1", "source1.ABCD", "Unsupported"]],
+    ],
+)
+def test_queue_status_table_matches_tabulate(status):
+    assert _queue_status_table(status) == tabulate.tabulate(status, headers=_HEADERS)
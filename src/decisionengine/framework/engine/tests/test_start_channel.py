@@ -0,0 +1,71 @@
+# SPDX-FileCopyrightText: 2017 Fermi Research Alliance, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import structlog
+
+from decisionengine.framework.engine.ChannelWorkers import ChannelWorkers
+from decisionengine.framework.engine.DecisionEngine import DecisionEngine
+from decisionengine.framework.taskmanager.ProcessingState import ProcessingState, State
+
+
+class SourceWorker:
+    def __init__(self):
+        self.pid = None
+        self.state = ProcessingState()
+
+    def start(self):
+        self.pid = 1
+
+
+class ChannelWorker:
+    def __init__(self, on_boot=None):
+        self.on_boot = on_boot
+        self.waited_on = []
+
+    def start(self):
+        pass
+
+    def wait_while(self, state):
+        self.waited_on.append(state)
+        if state == State.BOOT and self.on_boot is not None:
+            self.on_boot()
+
+
+def _decision_engine():
+    # Only the attributes used by start_channel are needed.
+    de = DecisionEngine.__new__(DecisionEngine)
+    de.channel_workers = ChannelWorkers()
+    de.logger = structlog.getLogger("test_start_channel")
+    return de
+
+
+def test_start_channel():
+    de = _decision_engine()
+    worker = ChannelWorker()
+    source = SourceWorker()
+    with de.channel_workers.access() as workers:
+        workers["channel"] = worker
+
+    de.start_channel("channel", {"source": source})
+
+    assert source.pid is not None
+    assert worker.waited_on == [State.BOOT, State.ACTIVE]
+
+
+def test_stop_channel_during_boot():
+    de = _decision_engine()
+    source = SourceWorker()
+
+    def stop_channel():
+        # What stop_channels and rm_channel do while the channel is booting
+        with de.channel_workers.access() as workers:
+            workers.clear()
+
+    worker = ChannelWorker(on_boot=stop_channel)
+    with de.channel_workers.access() as workers:
+        workers["channel"] = worker
+
+    de.start_channel("channel", {"source": source})
+
+    assert source.pid is None
+    assert worker.waited_on == [State.BOOT]
@@ -51,6 +51,12 @@ def test_change_port():
     assert _check_override(arguments) == {"server_address": ["localhost", 54321]}
 
 
+@pytest.mark.parametrize("port", ["0", "65535", "not_a_port"])
+def test_bad_port(port):
+    with pytest.raises(SystemExit):
+        parse_program_options([f"--port={port}"])
+
+
 def test_check_metrics_env_no_webserver():
     arguments = ["--no-webserver"]
     options = parse_program_options(arguments)
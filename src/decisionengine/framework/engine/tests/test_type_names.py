@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: 2017 Fermi Research Alliance, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import pandas as pd
+import pytest
+
+from decisionengine.framework.engine.DecisionEngine import _type_names
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        pd.Series([1, 2, 3]),
+        pd.Series([1.5, 2.5]),
+        pd.Series([True, False]),
+        pd.Series([1 + 2j, 3j]),
+        pd.Series([1, 2], dtype="uint8"),
+        pd.Series(["a", 1, None, 2.5]),
+        pd.Series(pd.to_datetime(["2021-01-01", "2021-01-02"])),
+        pd.Series(pd.to_timedelta(["1 day", "2 days"])),
+        pd.Series([1, None], dtype="Int64"),
+        pd.Series(["a", "b", "a"], dtype="category"),
+        pd.Series([], dtype="int64"),
+        pd.Series([], dtype=object),
+    ],
+    ids=[
+        "int",
+        "float",
+        "bool",
+        "complex",
+        "uint8",
+        "object",
+        "datetime",
+        "timedelta",
+        "nullable-int",
+        "categorical",
+        "empty-int",
+        "empty-object",
+    ],
+)
+def test_type_names(column):
+    expected = column.transform(lambda x: type(x).__name__)
+    type_names = _type_names(column)
+    assert type_names.tolist() == expected.tolist()
+    assert type_names.index.equals(column.index)
@@ -4,6 +4,7 @@
 import pytest
 
 from decisionengine.framework.engine.DecisionEngine import _verify_redis_server, _verify_redis_url
+from decisionengine.framework.util.redis_stats import get_redis_pool
 
 
 def test_verify_bad_url():
@@ -37,3 +38,9 @@ def test_verify_bad_redis_server():
     expected = f"A server with broker URL {url} is not responding."
     with pytest.raises(RuntimeError, match=expected):
         _verify_redis_server(url)
+
+
+def test_redis_pool_is_shared():
+    url = "redis://localhost:6379/0"
+    assert get_redis_pool(url) is get_redis_pool(url)
+    assert get_redis_pool(url) is not get_redis_pool("redis://localhost:6379/1")
@@ -126,10 +126,22 @@ class ProcessingState:
             raise
 
     def wait_until(self, state, timeout=None):
+        """
+        Block until the state has been entered or the timeout expires.
+
+        The wait is on a condition variable notified by `set`; the state is
+        not polled.
+        """
         with self._cv:
             self._cv.wait_for(lambda: self.has_value(state), timeout)
 
     def wait_while(self, state, timeout=None):
+        """
+        Block until the state has been exited or the timeout expires.
+
+        The wait is on a condition variable notified by `set`; the state is
+        not polled.
+        """
         with self._cv:
             self._cv.wait_for(lambda: not self.has_value(state), timeout)
 
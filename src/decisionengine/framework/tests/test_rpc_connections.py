@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2017 Fermi Research Alliance, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""Handling of persistent XML-RPC client connections"""
+# pylint: disable=redefined-outer-name
+
+import re
+import threading
+import time
+import xmlrpc.client
+
+from decisionengine.framework.engine.DecisionEngine import DEFAULT_RPC_MAX_THREADS, RPC_KEEP_ALIVE_TIMEOUT
+from decisionengine.framework.tests.fixtures import (  # noqa: F401
+    DEServer,
+    PG_DE_DB_WITHOUT_SCHEMA,
+    PG_PROG,
+    SQLALCHEMY_PG_WITH_SCHEMA,
+    SQLALCHEMY_TEMPFILE_SQLITE,
+    TEST_CHANNEL_CONFIG_PATH,
+    TEST_CONFIG_PATH,
+)
+
+deserver = DEServer(
+    conf_path=TEST_CONFIG_PATH, channel_conf_path=TEST_CHANNEL_CONFIG_PATH
+)  # pylint: disable=invalid-name
+
+
+def _server_proxy(deserver):
+    host, port = deserver.server_address
+    return xmlrpc.client.ServerProxy(f"http://{host}:{port}", allow_none=True)
+
+
+def _rpc_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith("DE-RPC")]
+
+
+def test_stop_closes_idle_connections(deserver):
+    # The first call leaves an idle keep-alive connection open.
+    idle_client = _server_proxy(deserver)
+    assert idle_client.kombu_info()
+
+    output = deserver.de_client_run_cli("--stop")
+    assert "OK" in output
+
+    # The threads serving the connections must not wait for the idle timeout.
+    for thread in _rpc_threads():
+        thread.join(RPC_KEEP_ALIVE_TIMEOUT / 3)
+        assert not thread.is_alive()
+
+
+def test_status_with_more_persistent_clients_than_threads(deserver):
+    # Idle connections give up their threads rather than making new clients
+    # wait for the idle timeout.
+    start = time.monotonic()
+
+    # Each client keeps its connection open after its first call.
+    clients = [_server_proxy(deserver) for _ in range(DEFAULT_RPC_MAX_THREADS + 4)]
+    for client in clients:
+        assert client.kombu_info()
+
+    output = deserver.de_client_run_cli("--status")
+    assert re.search("test_channel.*state = STEADY", output)
+    assert time.monotonic() - start < RPC_KEEP_ALIVE_TIMEOUT / 3
+
+    # Clients whose idle connections were closed transparently reconnect.
+    for client in clients:
+        assert client.kombu_info()
+
+
+def _run_with_timeout(func, timeout):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive()
+    return result[0]
+
+
+def test_stop_with_every_thread_blocked(deserver):
+    # Each client holds a thread for as long as the channel stays STEADY.
+    blocked_clients = [
+        threading.Thread(target=_server_proxy(deserver).block_while, args=("STEADY", None), daemon=True)
+        for _ in range(DEFAULT_RPC_MAX_THREADS)
+    ]
+    for client in blocked_clients:
+        client.start()
+
+    deadline = time.monotonic() + RPC_KEEP_ALIVE_TIMEOUT / 3
+    while deserver.de_server._rpc_connections < DEFAULT_RPC_MAX_THREADS:
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+
+    # Further requests are still served, rather than queued behind the blocked ones.
+    output = _run_with_timeout(lambda: deserver.de_client_run_cli("--status"), RPC_KEEP_ALIVE_TIMEOUT / 3)
+    assert re.search("test_channel.*state = STEADY", output)
+
+    _run_with_timeout(_server_proxy(deserver).stop, RPC_KEEP_ALIVE_TIMEOUT / 3)
+
+    # Stopping the channels releases the blocked clients.
+    for client in blocked_clients:
+        client.join(RPC_KEEP_ALIVE_TIMEOUT / 3)
+        assert not client.is_alive()
@@ -46,3 +46,24 @@ def test_shared_source(deserver_shared, caplog):
     output = deserver_shared.de_client_run_cli("--status")
     assert not re.search("channel: C", output, re.DOTALL)
     assert re.search("channel: D.*state = STEADY", output, re.DOTALL)
+
+
+def source_starts(records):
+    return sum(1 for r in records if "Started process" in r.message and "for source source" in r.message)
+
+
+def test_shared_source_parallel_launch(deserver_shared, caplog):
+    # Channels C and D are launched in parallel, but their shared source must be started only once.
+    assert source_starts(caplog.get_records(when="setup")) == 1
+
+    for _ in range(5):
+        output = deserver_shared.de_client_run_cli("--stop-channels")
+        assert "All channels stopped." in output
+
+        caplog.clear()
+        deserver_shared.de_client_run_cli("--start-channels")
+        output = deserver_shared.de_client_run_cli("--status")
+        assert re.search("channel: C.*state = STEADY", output, re.DOTALL)
+        assert re.search("channel: D.*state = STEADY", output, re.DOTALL)
+        assert source_starts(caplog.records) == 1
+        assert not record_that_matches("failed to start", caplog.records)
@@ -2,14 +2,27 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import re
+import threading
 
 import redis
 
 from kombu.transport.redis import Channel
 
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_redis_pool(broker_url):
+    """Return the connection pool shared by all Redis clients of the given broker URL."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(broker_url)
+        if pool is None:
+            pool = _POOLS[broker_url] = redis.ConnectionPool.from_url(broker_url)
+        return pool
+
 
 def redis_stats(broker_url, exchange):
-    r = redis.Redis.from_url(broker_url)
+    r = redis.Redis(connection_pool=get_redis_pool(broker_url))
     queue_to_routing_key = {}
     # The exchange name is prefixed by a Kombu-provided pattern
     for member in r.smembers(Channel.keyprefix_queue % exchange):